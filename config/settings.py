@@ -11,8 +11,17 @@ class Settings(BaseSettings):
     # Environment
     debug: bool = Field(default=False, alias="DEBUG")
     
+    # Event loop diagnostics (opt-in)
+    loop_debug: bool = Field(default=False, alias="LOOP_DEBUG")
+    loop_lag_threshold_ms: int = Field(default=100, alias="LOOP_LAG_THRESHOLD_MS")
+    profile_dir: str = Field(default="./profiles", alias="PROFILE_DIR")
+    profile_interval_ms: int = Field(default=5, alias="PROFILE_INTERVAL_MS")
+    
     # Google Places API
     google_places_api_key: str = Field(..., alias="GOOGLE_PLACES_API_KEY")
+    google_places_base_url: str = Field(default="https://maps.googleapis.com", alias="GOOGLE_PLACES_BASE_URL")
+    google_places_qps: int = Field(default=60, alias="GOOGLE_PLACES_QPS")  # Client-side rate limit
+    google_places_max_workers: int = Field(default=16, alias="GOOGLE_PLACES_MAX_WORKERS")
     
     # Database
     database_url: str = Field(default="sqlite:///./food_travel.db", alias="DATABASE_URL")
@@ -24,6 +33,20 @@ class Settings(BaseSettings):
     # Restaurant Search Limits
     max_search_radius_km: int = Field(default=50, alias="MAX_SEARCH_RADIUS")
     max_restaurants_per_search: int = Field(default=20, alias="MAX_RESTAURANTS")
+    page_token_delay_seconds: float = Field(default=2.0, alias="PAGE_TOKEN_DELAY")
+    
+    # Search Deadlines (0 disables the deadline)
+    search_timeout_seconds: float = Field(default=8.0, alias="SEARCH_TIMEOUT")
+    
+    # Hedged Google Places requests
+    hedge_requests: bool = Field(default=True, alias="HEDGE_REQUESTS")
+    hedge_delay_ms: int = Field(default=1500, alias="HEDGE_DELAY_MS")  # Used until enough latency samples
+    hedge_percentile: float = Field(default=95, alias="HEDGE_PERCENTILE")
+    hedge_max_in_flight: int = Field(default=4, alias="HEDGE_MAX_IN_FLIGHT")
+    
+    # Cache refresh (delta sync)
+    sync_batch_size: int = Field(default=500, alias="SYNC_BATCH_SIZE")
+    closed_after_missed_refreshes: int = Field(default=3, alias="CLOSED_AFTER_MISSED_REFRESHES")
     
     # Your existing backend (for future integration)
     backend_base_url: str = Field(default="http://localhost:5000", alias="BACKEND_BASE_URL")
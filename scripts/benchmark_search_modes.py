@@ -0,0 +1,141 @@
+"""Compare Text Search and Nearby Search for coordinate queries.
+
+Runs each query through both Google Places endpoints and reports latency
+and result quality (count, distance from the search point, rating, overlap).
+
+Usage:
+    python scripts/benchmark_search_modes.py [--runs 5] [--rank-by-distance]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from geopy.distance import geodesic
+
+from src.food_mcp.clients.google_places import GooglePlacesClient
+
+# (location, cuisine_type) pairs typical of mobile traffic
+QUERIES = [
+    ("40.7580,-73.9855", None),
+    ("40.7580,-73.9855", "Italian"),
+    ("37.7749,-122.4194", "Pizza"),
+    ("51.5074,-0.1278", "Indian"),
+    ("35.6762,139.6503", "Sushi"),
+]
+
+RADIUS_METERS = 5000
+
+
+async def timed_search(client, method, params):
+    """Run one sync Places call in a thread and return (elapsed_ms, restaurants)."""
+    start = time.perf_counter()
+    response = await asyncio.to_thread(method, **params)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    restaurants = []
+    for place in response.get("results", []):
+        restaurant_data = client._format_place_data(place)
+        if restaurant_data:
+            restaurants.append(restaurant_data)
+
+    return elapsed_ms, restaurants
+
+
+def mean_distance_km(center, restaurants):
+    """Mean distance of results from the search point."""
+    distances = [
+        geodesic(center, (r["latitude"], r["longitude"])).km
+        for r in restaurants
+        if r["latitude"] is not None and r["longitude"] is not None
+    ]
+    return statistics.mean(distances) if distances else float("nan")
+
+
+def mean_rating(restaurants):
+    """Mean rating of results."""
+    ratings = [r["rating"] for r in restaurants if r["rating"]]
+    return statistics.mean(ratings) if ratings else float("nan")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def benchmark(runs: int, rank_by_distance: bool):
+    """Benchmark both search modes over QUERIES."""
+    client = GooglePlacesClient()
+    latencies = {"text": [], "nearby": []}
+
+    print(f"{'query':<34} {'mode':<7} {'p50 ms':>8} {'count':>6} {'dist km':>8} {'rating':>7} {'overlap':>8}")
+    print("-" * 84)
+
+    for location, cuisine_type in QUERIES:
+        center = client.parse_coordinates(location)
+        text_params = client._text_search_params(location, RADIUS_METERS, cuisine_type)
+        nearby_params = client._nearby_search_params(
+            center, RADIUS_METERS, cuisine_type, rank_by_distance
+        )
+
+        results = {}
+        for mode, method, params in (
+            ("text", client.client.places, text_params),
+            ("nearby", client.client.places_nearby, nearby_params),
+        ):
+            run_latencies = []
+            restaurants = []
+            for _ in range(runs):
+                elapsed_ms, restaurants = await timed_search(client, method, params)
+                run_latencies.append(elapsed_ms)
+            latencies[mode].extend(run_latencies)
+            results[mode] = (statistics.median(run_latencies), restaurants)
+
+        text_ids = {r["google_place_id"] for r in results["text"][1]}
+        nearby_ids = {r["google_place_id"] for r in results["nearby"][1]}
+        union = text_ids | nearby_ids
+        overlap = len(text_ids & nearby_ids) / len(union) if union else 0.0
+
+        label = f"{location} {cuisine_type or ''}".strip()
+        for mode in ("text", "nearby"):
+            p50, restaurants = results[mode]
+            print(
+                f"{label:<34} {mode:<7} {p50:>8.0f} {len(restaurants):>6} "
+                f"{mean_distance_km(center, restaurants):>8.2f} "
+                f"{mean_rating(restaurants):>7.2f} {overlap:>8.0%}"
+            )
+
+    print("-" * 84)
+    for mode, values in latencies.items():
+        print(
+            f"{mode:<7} p50={percentile(values, 50):.0f}ms "
+            f"p95={percentile(values, 95):.0f}ms "
+            f"mean={statistics.mean(values):.0f}ms (n={len(values)})"
+        )
+
+
+def main():
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Runs per query and mode")
+    parser.add_argument(
+        "--rank-by-distance",
+        action="store_true",
+        help="Use rank_by=distance for Nearby Search"
+    )
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args.runs, args.rank_by_distance))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,16 +7,39 @@ import os
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateColumn
+
 from src.food_mcp.models.base import engine, Base
-from src.food_mcp.models.restaurant import RestaurantCache
+from src.food_mcp.models.restaurant import RestaurantCache, RestaurantRefresh
+
+# Columns added to existing tables after their first release; create_all skips existing tables
+ADDED_COLUMNS = {
+    RestaurantCache.__table__: ["content_hash", "possibly_closed"],
+}
+
+
+def add_missing_columns():
+    """Add columns that tables created by an older version are missing."""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table, column_names in ADDED_COLUMNS.items():
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for name in column_names:
+                if name in existing:
+                    continue
+                column_ddl = CreateColumn(table.c[name]).compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column_ddl}"))
+                print(f"Added column {table.name}.{name}")
 
 
 def init_database():
-    """Create all database tables."""
+    """Create all database tables and add columns missing from older tables."""
     print("Creating database tables...")
     Base.metadata.create_all(bind=engine)
+    add_missing_columns()
     print("Database tables created successfully!")
 
 
 if __name__ == "__main__":
-    init_database()
\ No newline at end of file
+    init_database()
@@ -0,0 +1,344 @@
+"""Concurrent load test for the MCP server over stdio.
+
+Spawns the real server process with the Google Places client pointed at a
+local stand-in (scripts/places_stub_server.py), replays a weighted query mix
+at a target concurrency or request rate, and reports throughput, latency
+percentiles, error rates and server CPU/RSS over time.
+
+Usage:
+    python scripts/load_test.py --concurrency 20 --duration 30
+    python scripts/load_test.py --rps 50 --concurrency 100 --mix mix.json
+
+A mix file is a JSON list of {"weight": 3, "arguments": {...}} entries,
+where arguments are passed to the search_restaurants tool.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Optional
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import psutil
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+from scripts.places_stub_server import start_stub_server
+
+TOOL_NAME = "search_restaurants"
+
+# Mostly coordinate queries, like mobile traffic
+DEFAULT_MIX = [
+    {"weight": 5, "arguments": {"location": "40.7580,-73.9855"}},
+    {"weight": 3, "arguments": {"location": "37.7749,-122.4194", "cuisine_type": "Pizza", "rank_by_distance": True}},
+    {"weight": 2, "arguments": {"location": "New York, NY", "cuisine_type": "Italian"}},
+    {"weight": 1, "arguments": {"location": "San Francisco, CA", "max_results": 60}},
+]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def classify(result) -> str:
+    """Classify a tool result as ok, partial or error."""
+    if result.isError:
+        return "error"
+    try:
+        data = json.loads(result.content[0].text)
+    except (IndexError, AttributeError, ValueError):
+        return "error"
+    if not data.get("success"):
+        return "error"
+    return "partial" if data.get("partial") else "ok"
+
+
+def find_server_process(module: str):
+    """Find the spawned server among this process's children."""
+    for child in psutil.Process(os.getpid()).children(recursive=True):
+        try:
+            if module in " ".join(child.cmdline()):
+                return child
+        except psutil.Error:
+            continue
+    return None
+
+
+class LoadTest:
+    """Drive concurrent tool calls against one server session."""
+
+    def __init__(self, session: ClientSession, mix, call_timeout: float):
+        self.session = session
+        self.mix = mix
+        self.weights = [entry["weight"] for entry in mix]
+        self.call_timeout = call_timeout
+        self.records = []  # (finished_at, latency_s, label, outcome)
+
+    async def call(self, scheduled_at: float):
+        """Make one tool call; latency counts from when it was scheduled."""
+        entry = random.choices(self.mix, weights=self.weights)[0]
+        arguments = entry["arguments"]
+        label = json.dumps(arguments, sort_keys=True)
+
+        try:
+            result = await asyncio.wait_for(
+                self.session.call_tool(TOOL_NAME, arguments),
+                timeout=self.call_timeout
+            )
+            outcome = classify(result)
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+        except Exception:
+            outcome = "error"
+
+        finished_at = time.monotonic()
+        self.records.append((finished_at, finished_at - scheduled_at, label, outcome))
+
+    async def run_closed_loop(self, concurrency: int, duration: float):
+        """Keep `concurrency` calls in flight until the duration elapses."""
+        stop_at = time.monotonic() + duration
+
+        async def worker():
+            while time.monotonic() < stop_at:
+                await self.call(time.monotonic())
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    async def run_open_loop(self, rps: float, concurrency: int, duration: float):
+        """Start calls at a fixed rate, capping in-flight calls at `concurrency`.
+
+        Latency is measured from each call's scheduled start, so time spent
+        waiting for a free slot is included.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        start = time.monotonic()
+        tasks = []
+
+        async def limited(scheduled_at):
+            async with semaphore:
+                await self.call(scheduled_at)
+
+        for i in range(int(rps * duration)):
+            scheduled_at = start + i / rps
+            await asyncio.sleep(max(0.0, scheduled_at - time.monotonic()))
+            tasks.append(asyncio.create_task(limited(scheduled_at)))
+
+        await asyncio.gather(*tasks)
+
+
+async def sample_resources(process, interval: float, samples, stop: asyncio.Event):
+    """Record (time, cpu %, rss MB) for the server process."""
+    if process is None:
+        return
+    process.cpu_percent(None)
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+        try:
+            samples.append((
+                time.monotonic(),
+                process.cpu_percent(None),
+                process.memory_info().rss / (1024 * 1024)
+            ))
+        except psutil.Error:
+            return
+
+
+async def watch_server(process, interval: float = 0.5) -> str:
+    """Return an error message once the server process is gone."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            alive = process.is_running() and process.status() != psutil.STATUS_ZOMBIE
+        except psutil.Error:
+            alive = False
+        if not alive:
+            return f"Server process {process.pid} exited during the load test"
+
+
+def report(load_test: LoadTest, samples, started_at: float, finished_at: float, interval: float):
+    """Print the load test summary."""
+    records = load_test.records
+    elapsed = finished_at - started_at
+    print("\n" + "=" * 72)
+
+    if not records:
+        print("No calls completed.")
+        return
+
+    outcomes = {}
+    for _, _, _, outcome in records:
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+    latencies_ms = [latency * 1000 for _, latency, _, _ in records]
+    print(f"Calls: {len(records)} in {elapsed:.1f}s ({len(records) / elapsed:.1f} calls/s)")
+    print("Outcomes: " + ", ".join(
+        f"{name}={count} ({count / len(records):.1%})" for name, count in sorted(outcomes.items())
+    ))
+    print(
+        "Latency ms: "
+        f"p50={percentile(latencies_ms, 50):.0f} p90={percentile(latencies_ms, 90):.0f} "
+        f"p95={percentile(latencies_ms, 95):.0f} p99={percentile(latencies_ms, 99):.0f} "
+        f"max={max(latencies_ms):.0f} mean={statistics.mean(latencies_ms):.0f}"
+    )
+
+    print("\nPer query:")
+    by_label = {}
+    for _, latency, label, outcome in records:
+        by_label.setdefault(label, []).append((latency * 1000, outcome))
+    for label, entries in sorted(by_label.items()):
+        values = [latency for latency, _ in entries]
+        errors = sum(1 for _, outcome in entries if outcome in ("error", "timeout"))
+        print(
+            f"  n={len(values):<5} p50={percentile(values, 50):>6.0f} p95={percentile(values, 95):>6.0f} "
+            f"errors={errors:<4} {label}"
+        )
+
+    print(f"\nTimeline ({interval:g}s buckets):")
+    print(f"  {'t':>6} {'calls/s':>8} {'p95 ms':>8} {'errors':>7} {'cpu %':>7} {'rss MB':>8}")
+    bucket_start = started_at
+    while bucket_start < finished_at:
+        bucket_end = bucket_start + interval
+        bucket = [r for r in records if bucket_start <= r[0] < bucket_end]
+        resources = [s for s in samples if bucket_start < s[0] <= bucket_end]
+        p95 = f"{percentile([r[1] * 1000 for r in bucket], 95):.0f}" if bucket else "-"
+        errors = sum(1 for r in bucket if r[3] in ("error", "timeout"))
+        cpu = f"{resources[-1][1]:.0f}" if resources else "-"
+        rss = f"{resources[-1][2]:.1f}" if resources else "-"
+        print(
+            f"  {bucket_start - started_at:>6.0f} {len(bucket) / interval:>8.1f} {p95:>8} "
+            f"{errors:>7} {cpu:>7} {rss:>8}"
+        )
+        bucket_start = bucket_end
+
+
+async def run(args) -> int:
+    """Start the stand-in and server, then drive load. Returns the exit code."""
+    mix = DEFAULT_MIX
+    if args.mix:
+        with open(args.mix) as f:
+            mix = json.load(f)
+
+    stub, base_url = start_stub_server(
+        latency_ms=args.upstream_latency_ms,
+        jitter=args.upstream_jitter,
+        error_rate=args.upstream_error_rate
+    )
+    print(f"Places stand-in on {base_url} (median {args.upstream_latency_ms:g}ms)")
+
+    env = {
+        **os.environ,
+        "PYTHONPATH": project_root,
+        "GOOGLE_PLACES_API_KEY": "AIzaLoadTestKey",
+        "GOOGLE_PLACES_BASE_URL": base_url,
+        "GOOGLE_PLACES_QPS": str(args.upstream_qps),
+        "PAGE_TOKEN_DELAY": "0",
+    }
+    server_params = StdioServerParameters(
+        command=sys.executable,
+        args=["-m", args.server_module],
+        env=env
+    )
+
+    # Errors are returned rather than raised: exceptions inside the MCP
+    # client's task groups surface wrapped in exception groups
+    try:
+        async with stdio_client(server_params) as (read, write):
+            async with ClientSession(read, write) as session:
+                error = await drive(session, args, mix)
+    finally:
+        stub.shutdown()
+
+    if error:
+        print(f"\nERROR: {error}")
+        return 1
+    return 0
+
+
+async def drive(session: ClientSession, args, mix) -> Optional[str]:
+    """Initialize the session and run the load; returns an error message on failure."""
+    try:
+        await asyncio.wait_for(session.initialize(), timeout=args.startup_timeout)
+    except asyncio.TimeoutError:
+        return (
+            f"Server did not initialize within {args.startup_timeout:g}s "
+            "(see its stderr output above)"
+        )
+
+    process = find_server_process(args.server_module)
+    if process is None:
+        print("Server process not found; skipping CPU/RSS sampling")
+
+    load_test = LoadTest(session, mix, args.call_timeout)
+    samples = []
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(
+        sample_resources(process, args.sample_interval, samples, stop)
+    )
+
+    mode = f"{args.rps:g} calls/s" if args.rps else "closed loop"
+    print(f"Running {mode}, concurrency {args.concurrency}, for {args.duration:g}s...")
+    started_at = time.monotonic()
+    if args.rps:
+        load = asyncio.create_task(load_test.run_open_loop(args.rps, args.concurrency, args.duration))
+    else:
+        load = asyncio.create_task(load_test.run_closed_loop(args.concurrency, args.duration))
+
+    # Stop as soon as the server dies instead of waiting on calls
+    error = None
+    if process is not None:
+        watcher = asyncio.create_task(watch_server(process))
+        await asyncio.wait([load, watcher], return_when=asyncio.FIRST_COMPLETED)
+        if watcher.done():
+            error = watcher.result()
+            load.cancel()
+        else:
+            watcher.cancel()
+    try:
+        await load
+    except asyncio.CancelledError:
+        pass
+    finished_at = time.monotonic()
+
+    stop.set()
+    await sampler
+
+    report(load_test, samples, started_at, finished_at, args.sample_interval)
+    return error
+
+
+def main():
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=10, help="Max calls in flight")
+    parser.add_argument("--rps", type=float, default=None, help="Target call rate (open loop); default is closed loop")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to generate load")
+    parser.add_argument("--mix", default=None, help="JSON file with a weighted query mix")
+    parser.add_argument("--startup-timeout", type=float, default=15, help="Seconds to wait for the server to initialize")
+    parser.add_argument("--call-timeout", type=float, default=30, help="Client-side timeout per call")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="Seconds between CPU/RSS samples")
+    parser.add_argument("--upstream-latency-ms", type=float, default=150, help="Stand-in median latency")
+    parser.add_argument("--upstream-jitter", type=float, default=0.5, help="Stand-in log-normal sigma")
+    parser.add_argument("--upstream-error-rate", type=float, default=0.0, help="Stand-in failure fraction")
+    parser.add_argument("--upstream-qps", type=int, default=1000, help="Places client rate limit during the test")
+    parser.add_argument("--server-module", default="src.food_mcp.server", help="Server module to spawn")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
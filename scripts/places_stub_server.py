@@ -0,0 +1,156 @@
+"""Local stand-in for the Google Places web service.
+
+Serves Text Search and Nearby Search with generated restaurants, paging
+and configurable latency, so the MCP server can be exercised without the
+live API. Point the server at it with GOOGLE_PLACES_BASE_URL.
+
+Usage:
+    python scripts/places_stub_server.py [--port 8765] [--latency-ms 150]
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+TEXT_SEARCH_PATH = "/maps/api/place/textsearch/json"
+NEARBY_SEARCH_PATH = "/maps/api/place/nearbysearch/json"
+SEARCH_PATHS = (TEXT_SEARCH_PATH, NEARBY_SEARCH_PATH)
+PAGE_SIZE = 20
+MAX_PAGES = 3
+
+
+def generate_page(query_key: str, page: int, nearby: bool = False):
+    """
+    Deterministic page of fake restaurants for a query.
+
+    Like the real API, Nearby Search results carry only "vicinity" and Text
+    Search results only "formatted_address".
+    """
+    seed = int(hashlib.sha256(f"{query_key}:{page}".encode("utf-8")).hexdigest()[:8], 16)
+    rng = random.Random(seed)
+    lat, lng = rng.uniform(-60, 60), rng.uniform(-180, 180)
+
+    results = []
+    for i in range(PAGE_SIZE):
+        place_id = f"stub-{seed:08x}-{i}"
+        address = f"{rng.randint(1, 999)} Test Street"
+        results.append({
+            "place_id": place_id,
+            "name": f"Stub Restaurant {page * PAGE_SIZE + i + 1}",
+            "vicinity" if nearby else "formatted_address": address,
+            "geometry": {"location": {"lat": lat + rng.uniform(-0.05, 0.05), "lng": lng + rng.uniform(-0.05, 0.05)}},
+            "rating": round(rng.uniform(3.0, 5.0), 1),
+            "user_ratings_total": rng.randint(0, 5000),
+            "price_level": rng.randint(0, 4),
+            "types": ["restaurant", "food", "point_of_interest", "establishment"]
+        })
+    return results
+
+
+def make_handler(latency_ms: float, jitter: float, error_rate: float, scripted_latency_ms=None):
+    """
+    Build a request handler with the given latency profile.
+
+    scripted_latency_ms, if given, sets the latency of the first requests in
+    order (e.g. [1000, 50] for a slow first and fast second request); later
+    requests fall back to the latency profile.
+    """
+    scripted = list(scripted_latency_ms or [])
+    lock = threading.Lock()
+
+    class PlacesStubHandler(BaseHTTPRequestHandler):
+        """Handle Places search requests."""
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path not in SEARCH_PATHS:
+                self._send(404, {"status": "NOT_FOUND"})
+                return
+
+            params = {key: values[0] for key, values in parse_qs(url.query).items()}
+            with lock:
+                self.server.request_count += 1
+                self.server.requests.append((url.path, params))
+                delay_ms = scripted.pop(0) if scripted else None
+
+            if delay_ms is None:
+                # Log-normal latency around the configured median
+                delay_ms = latency_ms * random.lognormvariate(0, jitter)
+            time.sleep(delay_ms / 1000)
+
+            if random.random() < error_rate:
+                self._send(500, {"status": "UNKNOWN_ERROR"})
+                return
+
+            search_params = dict(params)
+            token = search_params.pop("pagetoken", None)
+            if token:
+                query_key, page = token.rsplit("|", 1)
+                page = int(page)
+            else:
+                search_params.pop("key", None)
+                query_key, page = json.dumps(search_params, sort_keys=True), 0
+
+            body = {"status": "OK", "results": generate_page(query_key, page, url.path == NEARBY_SEARCH_PATH)}
+            if page + 1 < MAX_PAGES:
+                body["next_page_token"] = f"{query_key}|{page + 1}"
+            self._send(200, body)
+
+        def _send(self, status: int, body):
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            # Keep load test output readable
+            pass
+
+    return PlacesStubHandler
+
+
+def start_stub_server(
+    port: int = 0,
+    latency_ms: float = 150,
+    jitter: float = 0.5,
+    error_rate: float = 0.0,
+    scripted_latency_ms=None
+):
+    """
+    Start the stand-in in a background thread; returns (server, base_url).
+
+    ``server.request_count`` counts search requests received, and
+    ``server.requests`` lists each one as (path, query parameters).
+    """
+    handler = make_handler(latency_ms, jitter, error_rate, scripted_latency_ms)
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    server.request_count = 0
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, bound_port = server.server_address
+    return server, f"http://{host}:{bound_port}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--latency-ms", type=float, default=150, help="Median response latency")
+    parser.add_argument("--jitter", type=float, default=0.5, help="Log-normal sigma of latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(args.port, args.latency_ms, args.jitter, args.error_rate)
+    print(f"Places stand-in listening on {base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,37 @@
+"""Refresh cached restaurants for an area using incremental delta sync."""
+
+import argparse
+import asyncio
+import sys
+import os
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.food_mcp.services.place_sync_service import PlaceSyncService
+
+
+async def refresh(location: str, cuisine_type: str, radius_km: float):
+    """Refresh one area and print sync statistics."""
+    print(f"Refreshing restaurants for {location}...")
+    stats = await PlaceSyncService().refresh_area(
+        location=location,
+        cuisine_type=cuisine_type,
+        radius_km=radius_km
+    )
+    print(
+        f"Fetched {stats['fetched']}: {stats['inserted']} inserted, "
+        f"{stats['updated']} updated, {stats['unchanged']} unchanged, "
+        f"{stats['missing']} missing, {stats['possibly_closed']} possibly closed"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("location", help='Area to refresh, e.g. "New York, NY" or "40.7128,-74.0060"')
+    parser.add_argument("--cuisine", default=None, help="Cuisine type filter")
+    parser.add_argument("--radius-km", type=float, default=10, help="Search radius in kilometers")
+    args = parser.parse_args()
+
+    asyncio.run(refresh(args.location, args.cuisine, args.radius_km))
@@ -1,49 +1,162 @@
 """Google Places API client."""
 
 import asyncio
-from typing import List, Dict, Any, Optional
+import functools
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Callable, AsyncIterator
 import googlemaps
+from googlemaps.exceptions import ApiError
 import structlog
 
 from config.settings import settings
 
 logger = structlog.get_logger()
 
+# Matches "lat,lng" inputs such as "40.7128,-74.0060"
+COORDINATE_PATTERN = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$")
+
+# Google Places returns at most 3 pages of 20 results
+PAGE_SIZE = 20
+MAX_PAGES = 3
+
+# Attempts per page token; tokens take a moment to become valid
+PAGE_TOKEN_ATTEMPTS = 3
+
+
+class LatencyTracker:
+    """Rolling window of upstream latencies used to pick the hedge delay."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def record(self, seconds: float):
+        """Record one successful request latency."""
+        self.samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Nearest-rank percentile, or None until enough samples exist."""
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait before sending a hedged duplicate request."""
+        observed = self.percentile(settings.hedge_percentile)
+        if observed is None:
+            return settings.hedge_delay_ms / 1000
+        return observed
+
 
 class GooglePlacesClient:
     """Client for Google Places API."""
 
     def __init__(self):
-        self.client = googlemaps.Client(key=settings.google_places_api_key)
+        # Bound each HTTP request and googlemaps' own retries by the search
+        # budget, so abandoned requests free their worker thread promptly
+        budget = settings.search_timeout_seconds
+        self.client = googlemaps.Client(
+            key=settings.google_places_api_key,
+            base_url=settings.google_places_base_url,
+            queries_per_second=settings.google_places_qps,
+            timeout=budget if budget > 0 else None,
+            retry_timeout=budget if budget > 0 else 60
+        )
+        self.latency = LatencyTracker()
+
+        # Google Maps client is sync; keep its calls off the default executor
+        # so slow upstream requests cannot starve other to_thread work
+        self.executor = ThreadPoolExecutor(
+            max_workers=settings.google_places_max_workers,
+            thread_name_prefix="places"
+        )
+        self._hedges_in_flight = 0
+        self._hedge_lock = threading.Lock()
 
     async def search_restaurants(
         self,
         location: str,
         radius: int = 10000,
-        cuisine_type: Optional[str] = None
+        cuisine_type: Optional[str] = None,
+        rank_by_distance: bool = False,
+        deadline: Optional[float] = None,
+        max_pages: int = 1
     ) -> List[Dict[str, Any]]:
-        """Search for restaurants."""
+        """
+        Search for restaurants.
+
+        Coordinate inputs ("lat,lng") use the Nearby Search endpoint;
+        anything else goes through Text Search.
+
+        Args:
+            deadline: Absolute ``time.monotonic()`` value after which
+                ``asyncio.TimeoutError`` is raised [optional]
+            max_pages: Result pages to fetch, up to 3 [optional]
+        """
+        restaurants = []
         try:
-            # Build query
-            query = "restaurant"
-            if cuisine_type:
-                query = f"{cuisine_type} restaurant"
-
-            # Search parameters
-            search_params = {
-                "query": query,
-                "location": location,
-                "radius": min(radius, 50000),  # Google API limit
-                "type": "restaurant"
-            }
+            async for page in self.iter_restaurant_pages(
+                location=location,
+                radius=radius,
+                cuisine_type=cuisine_type,
+                rank_by_distance=rank_by_distance,
+                deadline=deadline,
+                max_pages=max_pages
+            ):
+                restaurants.extend(page)
 
-            # Execute search in thread pool (Google Maps client is sync)
-            response = await asyncio.to_thread(
-                self.client.places,
-                **search_params
+            logger.info(
+                "Restaurant search completed",
+                location=location,
+                cuisine=cuisine_type,
+                count=len(restaurants)
             )
 
-            # Format results
+            return restaurants
+
+        except asyncio.TimeoutError:
+            logger.warning("Restaurant search deadline exceeded", location=location)
+            raise
+        except Exception as e:
+            logger.error("Error searching restaurants", error=str(e))
+            return restaurants
+
+    async def iter_restaurant_pages(
+        self,
+        location: str,
+        radius: int = 10000,
+        cuisine_type: Optional[str] = None,
+        rank_by_distance: bool = False,
+        deadline: Optional[float] = None,
+        max_pages: int = 1
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yield formatted restaurants one result page at a time.
+
+        Errors and ``asyncio.TimeoutError`` propagate to the caller; pages
+        already yielded stay valid.
+        """
+        coordinates = self.parse_coordinates(location)
+
+        if coordinates:
+            mode = "nearby"
+            method = self.client.places_nearby
+            params = self._nearby_search_params(coordinates, radius, cuisine_type, rank_by_distance)
+        else:
+            mode = "text"
+            method = self.client.places
+            params = self._text_search_params(location, radius, cuisine_type)
+
+        max_pages = max(1, min(max_pages, MAX_PAGES))
+        response = await self._call_places(method, params, deadline)
+
+        for page in range(1, max_pages + 1):
             restaurants = []
             for place in response.get("results", []):
                 restaurant_data = self._format_place_data(place)
@@ -51,17 +164,176 @@ class GooglePlacesClient:
                     restaurants.append(restaurant_data)
 
             logger.info(
-                "Restaurant search completed",
+                "Restaurant page fetched",
                 location=location,
-                cuisine=cuisine_type,
+                mode=mode,
+                page=page,
                 count=len(restaurants)
             )
 
-            return restaurants
+            yield restaurants
 
-        except Exception as e:
-            logger.error("Error searching restaurants", error=str(e))
-            return []
+            page_token = response.get("next_page_token")
+            if not page_token or page == max_pages:
+                return
+
+            response = await self._fetch_next_page(method, page_token, deadline)
+
+    async def _fetch_next_page(
+        self,
+        method: Callable[..., Dict[str, Any]],
+        page_token: str,
+        deadline: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Fetch a follow-up page, waiting for the page token to become valid."""
+        for attempt in range(1, PAGE_TOKEN_ATTEMPTS + 1):
+            delay = settings.page_token_delay_seconds
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                raise asyncio.TimeoutError("Not enough time left for the next page")
+            await asyncio.sleep(delay)
+
+            try:
+                return await self._call_places(method, {"page_token": page_token}, deadline)
+            except ApiError as e:
+                # INVALID_REQUEST means the token is not valid yet
+                if e.status != "INVALID_REQUEST" or attempt == PAGE_TOKEN_ATTEMPTS:
+                    raise
+
+    async def _call_places(
+        self,
+        method: Callable[..., Dict[str, Any]],
+        params: Dict[str, Any],
+        deadline: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Run a sync Places call in the executor with deadline and hedging.
+
+        If the first request is slower than the hedge delay, an identical
+        request is sent and whichever succeeds first wins. At most
+        HEDGE_MAX_IN_FLIGHT hedges run at once across the client. Abandoned
+        requests are cancelled, though their worker threads run until the
+        HTTP timeout.
+        """
+        loop = asyncio.get_running_loop()
+        call_started = time.monotonic()
+
+        def spawn(hedge: bool = False) -> asyncio.Future:
+            func = functools.partial(method, **params)
+            if hedge:
+                func = functools.partial(self._run_hedge, func)
+            return loop.run_in_executor(self.executor, func)
+
+        hedge_at = None
+        if settings.hedge_requests:
+            hedge_at = call_started + self.latency.hedge_delay()
+
+        pending = {spawn()}
+        last_error: Optional[BaseException] = None
+        try:
+            while pending:
+                wake_times = [t for t in (deadline, hedge_at) if t is not None]
+                timeout = max(0.0, min(wake_times) - time.monotonic()) if wake_times else None
+
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        # Measured from the start of the call, including any
+                        # time spent before a hedge was sent
+                        self.latency.record(time.monotonic() - call_started)
+                        return task.result()
+                    last_error = task.exception()
+
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    raise asyncio.TimeoutError("Google Places request exceeded deadline")
+                if pending and hedge_at is not None and now >= hedge_at:
+                    hedge_at = None
+                    if self._reserve_hedge():
+                        logger.info("Sending hedged Google Places request", method=method.__name__)
+                        pending.add(spawn(hedge=True))
+                    else:
+                        logger.info("Hedge skipped, too many in flight", method=method.__name__)
+
+            if isinstance(last_error, googlemaps.exceptions.Timeout):
+                # The HTTP timeout or googlemaps' retry budget ran out first
+                raise asyncio.TimeoutError("Google Places request timed out") from last_error
+            raise last_error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _reserve_hedge(self) -> bool:
+        """Claim a hedge slot if fewer than HEDGE_MAX_IN_FLIGHT are running."""
+        with self._hedge_lock:
+            if self._hedges_in_flight >= settings.hedge_max_in_flight:
+                return False
+            self._hedges_in_flight += 1
+            return True
+
+    def _run_hedge(self, func: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Run a hedged request, releasing its slot when the thread finishes."""
+        try:
+            return func()
+        finally:
+            with self._hedge_lock:
+                self._hedges_in_flight -= 1
+
+    @staticmethod
+    def parse_coordinates(location: str) -> Optional[Tuple[float, float]]:
+        """Return (lat, lng) if location is a valid coordinate pair, else None."""
+        match = COORDINATE_PATTERN.match(location or "")
+        if not match:
+            return None
+
+        lat, lng = float(match.group(1)), float(match.group(2))
+        if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+            return None
+
+        return lat, lng
+
+    def _text_search_params(
+        self,
+        location: str,
+        radius: int,
+        cuisine_type: Optional[str]
+    ) -> Dict[str, Any]:
+        """Build Text Search parameters."""
+        query = "restaurant"
+        if cuisine_type:
+            query = f"{cuisine_type} restaurant"
+
+        return {
+            "query": query,
+            "location": location,
+            "radius": min(radius, 50000),  # Google API limit
+            "type": "restaurant"
+        }
+
+    def _nearby_search_params(
+        self,
+        coordinates: Tuple[float, float],
+        radius: int,
+        cuisine_type: Optional[str],
+        rank_by_distance: bool
+    ) -> Dict[str, Any]:
+        """Build Nearby Search parameters."""
+        params: Dict[str, Any] = {
+            "location": coordinates,
+            "type": "restaurant"
+        }
+
+        if cuisine_type:
+            params["keyword"] = cuisine_type
+
+        # rank_by=distance cannot be combined with radius
+        if rank_by_distance:
+            params["rank_by"] = "distance"
+        else:
+            params["radius"] = min(radius, 50000)  # Google API limit
+
+        return params
 
     def _format_place_data(self, place: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Format Google Places data."""
@@ -72,7 +344,8 @@ class GooglePlacesClient:
             return {
                 "google_place_id": place.get("place_id"),
                 "name": place.get("name"),
-                "address": place.get("formatted_address"),
+                # Nearby Search only returns "vicinity"
+                "address": place.get("formatted_address") or place.get("vicinity"),
                 "latitude": location.get("lat"),
                 "longitude": location.get("lng"),
                 "rating": place.get("rating", 0.0),
@@ -82,4 +355,4 @@ class GooglePlacesClient:
             }
         except Exception as e:
             logger.warning("Error formatting place data", error=str(e))
-            return None
\ No newline at end of file
+            return None
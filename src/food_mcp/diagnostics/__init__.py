@@ -0,0 +1,6 @@
+"""Diagnostics package."""
+
+from .loop_monitor import LoopMonitor
+from .profiler import ToolProfiler
+
+__all__ = ["LoopMonitor", "ToolProfiler"]
@@ -0,0 +1,120 @@
+"""Event loop lag monitor that logs the stack of blocking callbacks."""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+import structlog
+
+logger = structlog.get_logger()
+
+
+class LoopMonitor:
+    """
+    Detect event loop stalls.
+
+    A heartbeat task on the loop records when it last ran. A watchdog thread
+    notices when the heartbeat is overdue by more than the threshold and logs
+    the loop thread's current stack, i.e. the code that is blocking it.
+    Lag statistics are logged periodically.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float = 100,
+        interval_ms: float = 50,
+        report_seconds: float = 60
+    ):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.report_seconds = report_seconds
+
+        self.stalls = 0
+        self.max_lag = 0.0
+        self._lags = []
+        self._last_tick = time.monotonic()
+        self._reported_tick: Optional[float] = None
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start monitoring; must be called from the event loop thread."""
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._stop.clear()
+
+        self._heartbeat = asyncio.get_running_loop().create_task(self._beat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+        logger.info("Event loop monitor started", threshold_ms=self.threshold * 1000)
+
+    async def stop(self):
+        """Stop monitoring."""
+        self._stop.set()
+        if self._heartbeat:
+            self._heartbeat.cancel()
+            try:
+                await self._heartbeat
+            except asyncio.CancelledError:
+                pass
+        if self._watchdog:
+            # Joining is bounded by one watchdog interval
+            await asyncio.to_thread(self._watchdog.join)
+        self._report()
+
+    async def _beat(self):
+        """Measure how late each wake-up is."""
+        last_report = time.monotonic()
+        while True:
+            self._last_tick = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+            lag = time.monotonic() - self._last_tick - self.interval
+            self._lags.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+
+            if lag > self.threshold:
+                self.stalls += 1
+                logger.warning("Event loop stall ended", lag_ms=round(lag * 1000, 1))
+
+            if time.monotonic() - last_report >= self.report_seconds:
+                self._report()
+                last_report = time.monotonic()
+
+    def _watch(self):
+        """Watchdog thread: log the loop thread's stack while it is blocked."""
+        while not self._stop.wait(self.interval / 2):
+            tick = self._last_tick
+            overdue = time.monotonic() - tick - self.interval
+            if overdue <= self.threshold or tick == self._reported_tick:
+                continue
+
+            # One stack trace per stall
+            self._reported_tick = tick
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else "<unavailable>"
+            logger.warning(
+                "Event loop blocked",
+                blocked_ms=round(overdue * 1000, 1),
+                stack=stack
+            )
+
+    def _report(self):
+        """Log lag statistics since the last report."""
+        if not self._lags:
+            return
+        ordered = sorted(self._lags)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        logger.info(
+            "Event loop lag",
+            samples=len(ordered),
+            p99_ms=round(p99 * 1000, 1),
+            max_ms=round(ordered[-1] * 1000, 1),
+            stalls=self.stalls
+        )
+        self._lags = []
@@ -0,0 +1,115 @@
+"""Sampling profiler for the event loop thread, grouped by MCP tool."""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+import structlog
+
+logger = structlog.get_logger()
+
+TOOLS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tools")
+
+
+class ToolProfiler:
+    """
+    Sample the event loop thread's stack and write flame graph data per tool.
+
+    Samples are attributed to the outermost frame from the tools package, so
+    a sample taken while ``search_restaurants`` runs on the loop counts
+    towards that tool; everything else counts towards ``<loop>``. Idle time
+    spent waiting in the selector is skipped. Output is one collapsed-stack
+    file per tool (``<tool>-<timestamp>.folded``), readable by flamegraph.pl
+    or speedscope.
+    """
+
+    def __init__(self, output_dir: str = "./profiles", interval_ms: float = 5):
+        self.output_dir = output_dir
+        self.interval = interval_ms / 1000
+        self._stacks: Dict[str, Counter] = defaultdict(Counter)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._target_thread_id: Optional[int] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether sampling is in progress."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, thread_id: Optional[int] = None):
+        """Start sampling the given thread (default: the calling thread)."""
+        if self.running:
+            return
+        self._target_thread_id = thread_id or threading.get_ident()
+        self._stacks = defaultdict(Counter)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, name="tool-profiler", daemon=True)
+        self._thread.start()
+        logger.info("Tool profiler started", interval_ms=self.interval * 1000)
+
+    def stop(self):
+        """Stop sampling; profiles are written by the sampler thread on exit."""
+        self._stop.set()
+
+    def join(self, timeout: Optional[float] = None):
+        """Wait for the sampler thread to exit and write its profiles."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def toggle(self):
+        """Start or stop sampling (used as a signal handler on the loop thread)."""
+        if self.running:
+            self.stop()
+        else:
+            self.start()
+
+    def _sample(self):
+        """Sampler thread body."""
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target_thread_id)
+            if frame is None or self._is_idle(frame):
+                continue
+            tool, stack = self._collapse(frame)
+            self._stacks[tool][stack] += 1
+
+        self.dump()
+
+    def _is_idle(self, frame) -> bool:
+        """True if the loop is waiting for I/O rather than running code."""
+        code = frame.f_code
+        return code.co_name in ("select", "poll", "control") and code.co_filename.endswith("selectors.py")
+
+    def _collapse(self, frame):
+        """Return (tool name, folded stack) for a frame, outermost first."""
+        names = []
+        tool = "<loop>"
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            if code.co_filename.startswith(TOOLS_DIR):
+                tool = code.co_name
+            frame = frame.f_back
+        names.reverse()
+        return tool, ";".join(name.replace(";", ":") for name in names)
+
+    def dump(self) -> List[str]:
+        """Write collected stacks to <output_dir>/<tool>-<timestamp>.folded."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        timestamp = time.strftime("%Y%m%d-%H%M%S")
+        paths = []
+        for tool, stacks in self._stacks.items():
+            name = tool.strip("<>")
+            path = os.path.join(self.output_dir, f"{name}-{timestamp}.folded")
+            with open(path, "w") as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            paths.append(path)
+
+        logger.info(
+            "Tool profiles written",
+            samples={tool: sum(stacks.values()) for tool, stacks in self._stacks.items()},
+            files=paths
+        )
+        return paths
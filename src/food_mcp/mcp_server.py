@@ -0,0 +1,152 @@
+"""Minimal tool server on top of the MCP low-level server."""
+
+import inspect
+import typing
+from typing import Any, Callable, Dict, Optional
+import anyio
+import structlog
+from mcp.server import Server, request_ctx
+from mcp.server.session import ServerSession
+from mcp.server.stdio import stdio_server
+from mcp.shared.context import RequestContext
+from mcp.shared.exceptions import McpError
+from mcp.shared.session import RequestResponder
+from mcp.types import (
+    METHOD_NOT_FOUND, CallToolRequest, CallToolResult, ClientNotification, EmptyResult, ErrorData,
+    ListToolsRequest, ListToolsResult, LoggingLevel, ServerResult, SetLevelRequest, TextContent, Tool
+)
+
+logger = structlog.get_logger()
+
+JSON_TYPES = {str: "string", int: "integer", float: "number", bool: "boolean"}
+
+# Logging levels from least to most severe
+LOG_LEVELS = typing.get_args(LoggingLevel)
+
+
+def _input_schema(func: Callable) -> Dict[str, Any]:
+    """Build a JSON schema for a tool from its signature."""
+    properties = {}
+    required = []
+    for name, parameter in inspect.signature(func).parameters.items():
+        annotation = parameter.annotation
+        # Optional[X] is Union[X, None]
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        if args:
+            annotation = args[0]
+        properties[name] = {"type": JSON_TYPES.get(annotation, "string")}
+        if parameter.default is inspect.Parameter.empty:
+            required.append(name)
+    return {"type": "object", "properties": properties, "required": required}
+
+
+class McpServer:
+    """MCP server exposing async functions registered with ``@server.tool(name)``."""
+
+    def __init__(self, name: str):
+        self._server = Server(name)
+        self.tools: Dict[str, Callable] = {}
+        # Log messages are only sent once the client asks for them with logging/setLevel
+        self.log_level: Optional[LoggingLevel] = None
+        self._server.request_handlers[ListToolsRequest] = self._list_tools
+        self._server.request_handlers[CallToolRequest] = self._call_tool
+        self._server.request_handlers[SetLevelRequest] = self._set_level
+
+    def tool(self, name: str):
+        """Decorator to register a tool."""
+        def decorator(func):
+            self.tools[name] = func
+            return func
+        return decorator
+
+    @property
+    def request_context(self):
+        """Context of the request being handled; raises LookupError outside one."""
+        return self._server.request_context
+
+    def logging_enabled(self, level: LoggingLevel) -> bool:
+        """Whether the client asked for log messages at this level."""
+        if self.log_level is None:
+            return False
+        return LOG_LEVELS.index(level) >= LOG_LEVELS.index(self.log_level)
+
+    async def run(self):
+        """Serve over stdio until the client disconnects."""
+        async with stdio_server() as (read_stream, write_stream):
+            await self.serve(read_stream, write_stream)
+
+    async def serve(self, read_stream, write_stream):
+        """
+        Serve a connected client over a pair of message streams.
+
+        Each request is handled in its own task, so a slow tool call does not
+        hold up the requests behind it (mcp's ``Server.run`` awaits every
+        handler before reading the next message).
+        """
+        async with ServerSession(
+            read_stream,
+            write_stream,
+            self._server.create_initialization_options()
+        ) as session:
+            async with anyio.create_task_group() as task_group:
+                async for message in session.incoming_messages:
+                    if isinstance(message, RequestResponder):
+                        task_group.start_soon(self._respond, session, message)
+                    elif isinstance(message, ClientNotification):
+                        await self._notify(message.root)
+
+    async def _respond(self, session: ServerSession, responder: RequestResponder):
+        """Run the handler for one request and send its response."""
+        request = responder.request.root
+        handler = self._server.request_handlers.get(type(request))
+        if handler is None:
+            await responder.respond(ErrorData(code=METHOD_NOT_FOUND, message="Method not found"))
+            return
+
+        # Each task has its own context, so request_context is per request
+        request_ctx.set(RequestContext(responder.request_id, responder.request_meta, session))
+        try:
+            response = await handler(request)
+        except McpError as e:
+            response = e.error
+        except Exception as e:
+            logger.error("Error handling request", request=type(request).__name__, error=str(e))
+            response = ErrorData(code=0, message=str(e))
+
+        await responder.respond(response)
+
+    async def _notify(self, notification):
+        """Run the handler for a client notification, if one is registered."""
+        handler = self._server.notification_handlers.get(type(notification))
+        if handler is None:
+            return
+        try:
+            await handler(notification)
+        except Exception as e:
+            logger.error("Error handling notification", notification=type(notification).__name__, error=str(e))
+
+    async def _list_tools(self, _: ListToolsRequest) -> ServerResult:
+        tools = [
+            Tool(
+                name=name,
+                description=inspect.getdoc(func),
+                inputSchema=_input_schema(func)
+            )
+            for name, func in self.tools.items()
+        ]
+        return ServerResult(ListToolsResult(tools=tools))
+
+    async def _set_level(self, request: SetLevelRequest) -> ServerResult:
+        self.log_level = request.params.level
+        return ServerResult(EmptyResult())
+
+    async def _call_tool(self, request: CallToolRequest) -> ServerResult:
+        func: Optional[Callable] = self.tools.get(request.params.name)
+        if func is None:
+            result = CallToolResult(
+                content=[TextContent(type="text", text=f"Unknown tool: {request.params.name}")],
+                isError=True
+            )
+        else:
+            result = await func(**(request.params.arguments or {}))
+        return ServerResult(result)
@@ -1,6 +1,6 @@
 """Models package."""
 
 from .base import Base, TimestampMixin, get_db, engine
-from .restaurant import RestaurantCache
+from .restaurant import RestaurantCache, RestaurantRefresh
 
-__all__ = ["Base", "TimestampMixin", "get_db", "engine", "RestaurantCache"]
\ No newline at end of file
+__all__ = ["Base", "TimestampMixin", "get_db", "engine", "RestaurantCache", "RestaurantRefresh"]
\ No newline at end of file
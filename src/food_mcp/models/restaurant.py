@@ -1,6 +1,6 @@
 """Restaurant model for caching Google Places data."""
 
-from sqlalchemy import Column, Integer, String, Float, Boolean, Text, JSON
+from sqlalchemy import Column, Integer, String, Float, Boolean, Text, JSON, ForeignKey, UniqueConstraint, false
 from .base import Base, TimestampMixin
 
 
@@ -23,6 +23,10 @@ class RestaurantCache(Base, TimestampMixin):
     opening_hours = Column(JSON)
     photos = Column(JSON)  # Photo references
     
+    # Delta sync bookkeeping
+    content_hash = Column(String(64))  # SHA-256 of synced fields
+    possibly_closed = Column(Boolean, default=False, server_default=false(), nullable=False)
+    
     def to_dict(self):
         """Convert to dictionary."""
         return {
@@ -38,5 +42,22 @@ class RestaurantCache(Base, TimestampMixin):
             "price_level": self.price_level,
             "cuisine_types": self.cuisine_types,
             "opening_hours": self.opening_hours,
-            "photos": self.photos
-        }
\ No newline at end of file
+            "photos": self.photos,
+            "possibly_closed": self.possibly_closed
+        }
+
+
+class RestaurantRefresh(Base, TimestampMixin):
+    """Restaurants returned by a cache refresh key (location, cuisine, radius)."""
+    __tablename__ = "restaurant_refresh"
+    __table_args__ = (UniqueConstraint("refresh_key", "restaurant_id"),)
+
+    id = Column(Integer, primary_key=True)
+    refresh_key = Column(String(512), index=True, nullable=False)
+    restaurant_id = Column(
+        Integer,
+        ForeignKey("restaurant_cache.id", ondelete="CASCADE"),
+        index=True,
+        nullable=False
+    )
+    missed_refreshes = Column(Integer, default=0, nullable=False)  # Consecutive refreshes without it
@@ -1,10 +1,13 @@
 """Main MCP Server."""
 
 import asyncio
-from mcp import McpServer
+import signal
+import sys
 import structlog
 
 from config.settings import settings
+from .diagnostics import LoopMonitor, ToolProfiler
+from .mcp_server import McpServer
 from .services import RestaurantService
 from .tools import register_restaurant_tools
 
@@ -33,13 +36,44 @@ class FoodTravelMCPServer:
         """Run the MCP server."""
         logger.info("Starting Food Travel MCP Server")
         
-        # Run the MCP server
-        async with self.server:
+        if settings.loop_debug:
+            self._start_loop_diagnostics()
+        
+        # Run the MCP server over stdio
+        try:
             await self.server.run()
+        finally:
+            if settings.loop_debug:
+                await self._stop_loop_diagnostics()
+
+    def _start_loop_diagnostics(self):
+        """Start the loop lag monitor and install the profiler signal handler."""
+        self.loop_monitor = LoopMonitor(threshold_ms=settings.loop_lag_threshold_ms)
+        self.loop_monitor.start()
+        
+        # SIGUSR1 starts/stops the per-tool profiler (not available on Windows)
+        self.profiler = ToolProfiler(settings.profile_dir, settings.profile_interval_ms)
+        if hasattr(signal, "SIGUSR1"):
+            asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, self.profiler.toggle)
+            logger.info("Send SIGUSR1 to start/stop tool profiling", profile_dir=settings.profile_dir)
+
+    async def _stop_loop_diagnostics(self):
+        """Remove the signal handler and flush a running profile before exit."""
+        if hasattr(signal, "SIGUSR1"):
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGUSR1)
+        
+        # The sampler thread is a daemon; wait for it so its profiles get written
+        self.profiler.stop()
+        await asyncio.to_thread(self.profiler.join, 5)
+        
+        await self.loop_monitor.stop()
 
 
 async def main():
     """Entry point."""
+    # stdout carries the MCP stdio transport; keep logs on stderr
+    structlog.configure(logger_factory=structlog.PrintLoggerFactory(file=sys.stderr))
+    
     server = FoodTravelMCPServer()
     await server.run()
 
@@ -1,5 +1,12 @@
 """Services package."""
 
-from .restaurant_service import RestaurantService
+from .restaurant_service import RestaurantService, SearchIncomplete, SearchDeadlineExceeded, SearchPageFailed
+from .place_sync_service import PlaceSyncService
 
-__all__ = ["RestaurantService"]
\ No newline at end of file
+__all__ = [
+    "RestaurantService",
+    "SearchIncomplete",
+    "SearchDeadlineExceeded",
+    "SearchPageFailed",
+    "PlaceSyncService"
+]
\ No newline at end of file
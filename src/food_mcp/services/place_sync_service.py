@@ -0,0 +1,293 @@
+"""Incremental delta sync of Google Places results into the restaurant cache."""
+
+import asyncio
+import hashlib
+import json
+from typing import List, Dict, Any, Optional, Iterator
+from sqlalchemy import select, insert, update
+import structlog
+
+from config.settings import settings
+from ..clients import GooglePlacesClient
+from ..clients.google_places import MAX_PAGES, PAGE_SIZE
+from ..models import RestaurantCache, RestaurantRefresh
+from ..models.base import SessionLocal
+
+logger = structlog.get_logger()
+
+# Place fields copied into RestaurantCache columns and covered by content_hash
+SYNCED_FIELDS = {
+    "name": "name",
+    "address": "address",
+    "latitude": "latitude",
+    "longitude": "longitude",
+    "rating": "rating",
+    "user_ratings_total": "user_ratings_total",
+    "price_level": "price_level",
+    "types": "cuisine_types",
+}
+
+
+def content_hash(place: Dict[str, Any]) -> str:
+    """Stable SHA-256 of the synced fields of a formatted place."""
+    payload = {field: place.get(field) for field in SYNCED_FIELDS}
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def refresh_key(location: str, cuisine_type: Optional[str], radius_km: float) -> str:
+    """Identify a refresh by its query; misses are only counted within a key."""
+    return "|".join([
+        location.strip().lower(),
+        (cuisine_type or "").strip().lower(),
+        f"{radius_km:g}"
+    ])
+
+
+def _chunks(items: List[Any], size: int) -> Iterator[List[Any]]:
+    """Yield successive chunks of items."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class PlaceSyncService:
+    """Refresh cached places, writing only new and changed rows."""
+    
+    def __init__(self, session_factory=SessionLocal):
+        self.google_client = GooglePlacesClient()
+        self.session_factory = session_factory
+    
+    async def refresh_area(
+        self,
+        location: str,
+        cuisine_type: Optional[str] = None,
+        radius_km: float = 10
+    ) -> Dict[str, int]:
+        """
+        Fetch every result page for an area and sync it into the cache.
+        
+        Misses are only counted when every result was fetched: not after a
+        page error, and not when the area has more places than Google's
+        60-result cap.
+        
+        Args:
+            location: Location to refresh
+            cuisine_type: Type of cuisine to filter by
+            radius_km: Search radius in kilometers
+            
+        Returns:
+            Sync statistics (see sync_places)
+        """
+        restaurants = []
+        complete = True
+        pages = self.google_client.iter_restaurant_pages(
+            location=location,
+            radius=int(radius_km * 1000),
+            cuisine_type=cuisine_type,
+            max_pages=MAX_PAGES
+        )
+        page = []
+        page_count = 0
+        try:
+            async for page in pages:
+                restaurants.extend(page)
+                page_count += 1
+        except Exception as e:
+            # A truncated result set must not count the unfetched places as missing
+            complete = False
+            logger.warning("Area refresh incomplete", location=location, error=str(e), fetched=len(restaurants))
+        finally:
+            await pages.aclose()
+        
+        # Google stops after 3 pages; a full last page means more places were
+        # left out, and one dropping out of the top 60 is not a miss
+        if complete and page_count == MAX_PAGES and len(page) >= PAGE_SIZE:
+            complete = False
+            logger.info("Area refresh hit the result cap, misses not counted", location=location)
+        
+        # Database access is sync; keep it off the event loop
+        stats = await asyncio.to_thread(
+            self.sync_places,
+            restaurants,
+            refresh_key(location, cuisine_type, radius_km),
+            complete
+        )
+        
+        logger.info("Area refresh completed", location=location, cuisine=cuisine_type, **stats)
+        return stats
+    
+    def sync_places(
+        self,
+        places: List[Dict[str, Any]],
+        refresh_key: Optional[str] = None,
+        complete: bool = True
+    ) -> Dict[str, int]:
+        """
+        Sync formatted places into RestaurantCache.
+        
+        New places are inserted and places whose content hash changed are
+        updated, both in batched statements; unchanged rows are not written.
+        
+        With a refresh_key, the places are recorded as returned by that key.
+        Places previously returned by the same key but missing now get their
+        missed count bumped and are flagged possibly_closed after
+        CLOSED_AFTER_MISSED_REFRESHES misses in a row. Places only other
+        keys returned (e.g. other cuisines) are not counted.
+        
+        Args:
+            places: Places as returned by GooglePlacesClient
+            refresh_key: Query the places came from (see refresh_key()) [optional]
+            complete: False if the places are not every result of the query
+                (a page failed or the result cap was hit); misses are then
+                not counted [optional]
+            
+        Returns:
+            Counts of fetched, inserted, updated, unchanged, missing and
+            possibly_closed rows
+        """
+        incoming = {}
+        for place in places:
+            if place.get("google_place_id") and place.get("name"):
+                incoming[place["google_place_id"]] = place
+        
+        stats = {
+            "fetched": len(incoming),
+            "inserted": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "missing": 0,
+            "possibly_closed": 0
+        }
+        
+        # An empty fetch is more likely an upstream error than a closed area
+        if not incoming:
+            return stats
+        
+        batch_size = settings.sync_batch_size
+        
+        with self.session_factory() as db:
+            existing = self._existing_rows(db, list(incoming))
+            
+            inserts, updates, reopened = [], [], []
+            for place_id, place in incoming.items():
+                row = self._row_values(place)
+                if place_id not in existing:
+                    inserts.append({"google_place_id": place_id, **row})
+                    continue
+                
+                row_id, row_hash, possibly_closed = existing[place_id]
+                if row_hash != row["content_hash"]:
+                    updates.append({"id": row_id, **row})
+                elif possibly_closed:
+                    reopened.append(row_id)
+            
+            for chunk in _chunks(inserts, batch_size):
+                db.execute(insert(RestaurantCache), chunk)
+            
+            for chunk in _chunks(updates, batch_size):
+                db.execute(update(RestaurantCache), chunk)
+            
+            # Unchanged rows only need writing if they were flagged closed
+            self._set_possibly_closed(db, reopened, False)
+            
+            if refresh_key:
+                if inserts:
+                    inserted = self._existing_rows(db, [row["google_place_id"] for row in inserts])
+                    existing.update(inserted)
+                row_ids = {row_id for row_id, _, _ in existing.values()}
+                missing, closed = self._track_refresh(db, refresh_key, row_ids, complete)
+                stats["missing"] = len(missing)
+                stats["possibly_closed"] = len(closed)
+            
+            db.commit()
+        
+        stats["inserted"] = len(inserts)
+        stats["updated"] = len(updates)
+        stats["unchanged"] = len(incoming) - len(inserts) - len(updates)
+        
+        logger.info("Place sync completed", refresh_key=refresh_key, complete=complete, **stats)
+        return stats
+    
+    def _existing_rows(self, db, place_ids: List[str]) -> Dict[str, tuple]:
+        """Map google_place_id to (id, content_hash, possibly_closed) for stored rows."""
+        existing = {}
+        for chunk in _chunks(place_ids, settings.sync_batch_size):
+            rows = db.execute(
+                select(
+                    RestaurantCache.google_place_id,
+                    RestaurantCache.id,
+                    RestaurantCache.content_hash,
+                    RestaurantCache.possibly_closed
+                ).where(RestaurantCache.google_place_id.in_(chunk))
+            )
+            for place_id, row_id, row_hash, possibly_closed in rows:
+                existing[place_id] = (row_id, row_hash, possibly_closed)
+        return existing
+    
+    def _track_refresh(self, db, key: str, row_ids: set, complete: bool):
+        """
+        Record which rows a refresh key returned and count misses.
+        
+        Returns:
+            (missing row ids, row ids flagged possibly_closed)
+        """
+        batch_size = settings.sync_batch_size
+        links = dict(db.execute(
+            select(RestaurantRefresh.restaurant_id, RestaurantRefresh.missed_refreshes)
+            .where(RestaurantRefresh.refresh_key == key)
+        ).all())
+        
+        new_links = [
+            {"refresh_key": key, "restaurant_id": row_id, "missed_refreshes": 0}
+            for row_id in row_ids if row_id not in links
+        ]
+        for chunk in _chunks(new_links, batch_size):
+            db.execute(insert(RestaurantRefresh), chunk)
+        
+        # Seen again after being missed: reset the count
+        self._set_missed(db, key, [row_id for row_id in row_ids if links.get(row_id)], reset=True)
+        
+        if not complete:
+            return [], []
+        
+        missing = [row_id for row_id in links if row_id not in row_ids]
+        self._set_missed(db, key, missing, reset=False)
+        
+        closed = [
+            row_id for row_id in missing
+            if links[row_id] + 1 >= settings.closed_after_missed_refreshes
+        ]
+        self._set_possibly_closed(db, closed, True)
+        
+        return missing, closed
+    
+    def _set_missed(self, db, key: str, row_ids: List[int], reset: bool):
+        """Reset or increment missed_refreshes for a key's rows, in batches."""
+        missed = 0 if reset else RestaurantRefresh.missed_refreshes + 1
+        for chunk in _chunks(row_ids, settings.sync_batch_size):
+            db.execute(
+                update(RestaurantRefresh)
+                .where(
+                    RestaurantRefresh.refresh_key == key,
+                    RestaurantRefresh.restaurant_id.in_(chunk)
+                )
+                .values(missed_refreshes=missed)
+                .execution_options(synchronize_session=False)
+            )
+    
+    def _set_possibly_closed(self, db, row_ids: List[int], possibly_closed: bool):
+        """Set possibly_closed on cached rows, in batches."""
+        for chunk in _chunks(row_ids, settings.sync_batch_size):
+            db.execute(
+                update(RestaurantCache)
+                .where(RestaurantCache.id.in_(chunk))
+                .values(possibly_closed=possibly_closed)
+                .execution_options(synchronize_session=False)
+            )
+    
+    def _row_values(self, place: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a formatted place to RestaurantCache column values."""
+        row = {column: place.get(field) for field, column in SYNCED_FIELDS.items()}
+        row["content_hash"] = content_hash(place)
+        row["possibly_closed"] = False
+        return row
@@ -1,25 +1,61 @@
 """Restaurant service for business logic."""
 
-from typing import List, Dict, Any, Optional
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, AsyncIterator
 import structlog
 
+from config.settings import settings
 from ..clients import GooglePlacesClient
+from ..clients.google_places import PAGE_SIZE
 
 logger = structlog.get_logger()
 
 
+class SearchIncomplete(Exception):
+    """Raised when a search ends early; carries any partial results."""
+
+    def __init__(self, partial_results: List[Dict[str, Any]], message: str):
+        super().__init__(message)
+        self.partial_results = partial_results
+
+
+class SearchDeadlineExceeded(SearchIncomplete):
+    """Raised when a search misses its deadline."""
+
+    def __init__(self, partial_results: List[Dict[str, Any]], timeout_seconds: float):
+        super().__init__(partial_results, f"Search exceeded deadline of {timeout_seconds}s")
+        self.timeout_seconds = timeout_seconds
+
+
+class SearchPageFailed(SearchIncomplete):
+    """Raised when a follow-up result page fails after earlier pages arrived."""
+
+    def __init__(self, partial_results: List[Dict[str, Any]], page: int):
+        super().__init__(partial_results, f"Result page {page} could not be fetched")
+        self.page = page
+
+
 class RestaurantService:
     """Service for restaurant-related operations."""
     
+    # Recent searches kept for partial results when a deadline is hit
+    RECENT_RESULTS_SIZE = 256
+    
     def __init__(self):
         self.google_client = GooglePlacesClient()
+        self._recent_results = OrderedDict()
     
     async def search_restaurants(
         self,
         location: str,
         cuisine_type: Optional[str] = None,
         radius_km: float = 10,
-        max_results: int = 10
+        max_results: int = 10,
+        rank_by_distance: bool = False,
+        timeout_seconds: Optional[float] = None
     ) -> List[Dict[str, Any]]:
         """
         Search for restaurants using Google Places API.
@@ -29,40 +65,148 @@ class RestaurantService:
             cuisine_type: Type of cuisine to filter by
             radius_km: Search radius in kilometers
             max_results: Maximum number of results to return
+            rank_by_distance: Order coordinate searches by distance
+            timeout_seconds: Time budget for the search (default and maximum:
+                settings.search_timeout_seconds)
             
         Returns:
             List of restaurant data dictionaries
+            
+        Raises:
+            SearchDeadlineExceeded: If the deadline is hit; carries the
+                results fetched so far, or recently cached results
+            SearchPageFailed: If a later page fails; carries the results
+                fetched so far
         """
-        try:
-            logger.info(
-                "Starting restaurant search",
-                location=location,
-                cuisine=cuisine_type,
-                radius=radius_km
-            )
+        restaurants = []
+        async for page in self.stream_restaurants(
+            location=location,
+            cuisine_type=cuisine_type,
+            radius_km=radius_km,
+            max_results=max_results,
+            rank_by_distance=rank_by_distance,
+            timeout_seconds=timeout_seconds
+        ):
+            restaurants.extend(page)
+        
+        return restaurants
+    
+    async def stream_restaurants(
+        self,
+        location: str,
+        cuisine_type: Optional[str] = None,
+        radius_km: float = 10,
+        max_results: int = 10,
+        rank_by_distance: bool = False,
+        timeout_seconds: Optional[float] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Search for restaurants, yielding each result page as it arrives.
+        
+        Takes the same arguments as search_restaurants. Enough pages are
+        fetched to cover max_results (20 per page, up to 3 pages).
+        An upstream error before any results arrive is logged and ends the
+        stream empty.
+        
+        Yields:
+            Lists of restaurant data dictionaries, one per page
             
-            # Convert km to meters for Google Places API
-            radius_meters = int(radius_km * 1000)
+        Raises:
+            SearchDeadlineExceeded: If the deadline is hit; carries every
+                result yielded so far, or recently cached results if none
+            SearchPageFailed: If a later page fails; carries every result
+                yielded so far
+        """
+        budget = settings.search_timeout_seconds
+        if timeout_seconds is None:
+            timeout_seconds = budget
+        elif budget > 0:
+            # Places HTTP requests are bounded by SEARCH_TIMEOUT, so it is also the maximum
+            timeout_seconds = min(timeout_seconds, budget) if timeout_seconds > 0 else budget
+        deadline = time.monotonic() + timeout_seconds if timeout_seconds > 0 else None
+        
+        cache_key = (location, cuisine_type, radius_km, rank_by_distance)
+        max_pages = math.ceil(max_results / PAGE_SIZE) if max_results else 1
+        
+        logger.info(
+            "Starting restaurant search",
+            location=location,
+            cuisine=cuisine_type,
+            radius=radius_km,
+            max_pages=max_pages,
+            timeout=timeout_seconds
+        )
+        
+        # Convert km to meters for Google Places API
+        radius_meters = int(radius_km * 1000)
+        
+        pages = self.google_client.iter_restaurant_pages(
+            location=location,
+            radius=radius_meters,
+            cuisine_type=cuisine_type,
+            rank_by_distance=rank_by_distance,
+            deadline=deadline,
+            max_pages=max_pages
+        )
+        
+        restaurants = []
+        page_number = 0
+        try:
+            async for page in pages:
+                page_number += 1
+                
+                # Limit results
+                if max_results:
+                    page = page[:max_results - len(restaurants)]
+                
+                restaurants.extend(page)
+                yield page
+                
+                if max_results and len(restaurants) >= max_results:
+                    break
             
-            # Search using Google Places
-            restaurants = await self.google_client.search_restaurants(
+        except asyncio.TimeoutError:
+            partial = restaurants or self._recent_results_for(cache_key)[:max_results]
+            logger.warning(
+                "Restaurant search deadline exceeded",
                 location=location,
-                radius=radius_meters,
-                cuisine_type=cuisine_type
+                timeout=timeout_seconds,
+                partial_count=len(partial)
             )
-            
-            # Limit results
-            if max_results and len(restaurants) > max_results:
-                restaurants = restaurants[:max_results]
-            
-            logger.info(
-                "Restaurant search completed",
-                total_found=len(restaurants),
-                location=location
-            )
-            
-            return restaurants
-            
+            raise SearchDeadlineExceeded(partial, timeout_seconds)
         except Exception as e:
-            logger.error("Error in restaurant service search", error=str(e))
-            raise
\ No newline at end of file
+            logger.error("Error in restaurant service search", error=str(e), results_found=len(restaurants))
+            if restaurants:
+                # Pages already yielded stand, but the result is truncated
+                raise SearchPageFailed(restaurants, page_number + 1) from e
+            return
+        finally:
+            await pages.aclose()
+        
+        self._remember_results(cache_key, restaurants)
+        
+        logger.info(
+            "Restaurant search completed",
+            total_found=len(restaurants),
+            location=location
+        )
+    
+    def _remember_results(self, cache_key, restaurants: List[Dict[str, Any]]):
+        """Store results for partial responses, evicting the oldest entries."""
+        if not restaurants:
+            return
+        self._recent_results[cache_key] = (time.monotonic(), restaurants)
+        self._recent_results.move_to_end(cache_key)
+        while len(self._recent_results) > self.RECENT_RESULTS_SIZE:
+            self._recent_results.popitem(last=False)
+    
+    def _recent_results_for(self, cache_key) -> List[Dict[str, Any]]:
+        """Return stored results younger than the cache TTL, else empty."""
+        entry = self._recent_results.get(cache_key)
+        if not entry:
+            return []
+        stored_at, restaurants = entry
+        if time.monotonic() - stored_at > settings.cache_ttl_seconds:
+            del self._recent_results[cache_key]
+            return []
+        return restaurants
@@ -2,13 +2,64 @@
 
 import json
 from typing import Optional
-from mcp import McpServer
-from mcp.types import Tool, CallToolResult, TextContent
+from mcp.types import CallToolResult, TextContent
 import structlog
 
+from ..mcp_server import McpServer
+from ..services import SearchIncomplete
+
 logger = structlog.get_logger()
 
 
+def _request_session(server: McpServer):
+    """Return (session, progress_token) for the current tool call, if any."""
+    try:
+        request_context = server.request_context
+    except (AttributeError, LookupError):
+        return None, None
+    
+    meta = getattr(request_context, "meta", None)
+    return request_context.session, getattr(meta, "progressToken", None)
+
+
+async def _stream_search(server: McpServer, restaurant_service, **search_kwargs):
+    """
+    Run a streaming search, notifying the client as each page arrives.
+    
+    Each page is sent as a progress notification when the client supplied a
+    progress token, and as an info log message carrying the page's
+    restaurants when the client enabled logging with logging/setLevel.
+    Clients that opted into neither get no notifications. Returns every
+    restaurant found.
+    """
+    session, progress_token = _request_session(server)
+    send_pages = session is not None and server.logging_enabled("info")
+    total = search_kwargs.get("max_results")
+    
+    restaurants = []
+    page_number = 0
+    async for page in restaurant_service.stream_restaurants(**search_kwargs):
+        restaurants.extend(page)
+        page_number += 1
+        
+        if session is None:
+            continue
+        
+        try:
+            if progress_token is not None:
+                await session.send_progress_notification(progress_token, len(restaurants), total)
+            if send_pages:
+                await session.send_log_message(
+                    level="info",
+                    data={"page": page_number, "restaurants": page},
+                    logger="search_restaurants"
+                )
+        except Exception as e:
+            logger.warning("Error sending search progress", error=str(e), page=page_number)
+    
+    return restaurants
+
+
 def register_restaurant_tools(server: McpServer, restaurant_service):
     """Register restaurant-related MCP tools."""
     
@@ -17,7 +68,10 @@ def register_restaurant_tools(server: McpServer, restaurant_service):
         location: str,
         cuisine_type: Optional[str] = None,
         radius_km: Optional[float] = None,
-        max_results: Optional[int] = None
+        max_results: Optional[int] = None,
+        rank_by_distance: Optional[bool] = None,
+        timeout_seconds: Optional[float] = None,
+        stream: Optional[bool] = None
     ) -> CallToolResult:
         """
         Search for restaurants based on location and preferences.
@@ -26,10 +80,16 @@ def register_restaurant_tools(server: McpServer, restaurant_service):
             location: Location to search (e.g., "New York, NY" or "40.7128,-74.0060")
             cuisine_type: Type of cuisine (e.g., "Italian", "Chinese") [optional]
             radius_km: Search radius in kilometers (default: 10) [optional]
-            max_results: Maximum number of results (default: 10) [optional]
+            max_results: Maximum number of results, up to 60 (default: 10) [optional]
+            rank_by_distance: Order results by distance for "lat,lng" locations (default: false) [optional]
+            timeout_seconds: Time budget for the search, at most 8 (default: 8) [optional]
+            stream: Send each result page as a notification while later pages load (default: false) [optional]
             
         Returns:
             List of restaurants with details like name, address, rating, etc.
+            If the time budget runs out or a later result page fails, the
+            results fetched so far (or recently cached results) are
+            returned with "partial": true.
         """
         try:
             logger.info(
@@ -40,19 +100,27 @@ def register_restaurant_tools(server: McpServer, restaurant_service):
                 max_results=max_results
             )
             
-            # Use the restaurant service to perform the search
-            restaurants = await restaurant_service.search_restaurants(
+            search_kwargs = dict(
                 location=location,
                 cuisine_type=cuisine_type,
                 radius_km=radius_km or 10,  # Default 10km
-                max_results=max_results or 10  # Default 10 results
+                max_results=max_results or 10,  # Default 10 results
+                rank_by_distance=bool(rank_by_distance),
+                timeout_seconds=timeout_seconds
             )
             
+            # Use the restaurant service to perform the search
+            if stream:
+                restaurants = await _stream_search(server, restaurant_service, **search_kwargs)
+            else:
+                restaurants = await restaurant_service.search_restaurants(**search_kwargs)
+            
             # Format the response
             result = {
                 "success": True,
                 "location": location,
                 "total_results": len(restaurants),
+                "partial": False,
                 "restaurants": restaurants
             }
             
@@ -66,6 +134,26 @@ def register_restaurant_tools(server: McpServer, restaurant_service):
                 content=[TextContent(type="text", text=json.dumps(result, indent=2))]
             )
             
+        except SearchIncomplete as e:
+            logger.warning(
+                "Restaurant search returned partial results",
+                location=location,
+                results_count=len(e.partial_results)
+            )
+            
+            partial_result = {
+                "success": True,
+                "location": location,
+                "total_results": len(e.partial_results),
+                "partial": True,
+                "message": str(e),
+                "restaurants": e.partial_results
+            }
+            
+            return CallToolResult(
+                content=[TextContent(type="text", text=json.dumps(partial_result, indent=2))]
+            )
+            
         except Exception as e:
             logger.error("Error in restaurant search", error=str(e), location=location)
             
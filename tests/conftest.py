@@ -8,6 +8,10 @@ from dotenv import load_dotenv
 # Load environment variables for all tests
 load_dotenv()
 
+# Settings require an API key; the placeholder lets offline tests import the
+# package while live API tests still skip
+os.environ.setdefault("GOOGLE_PLACES_API_KEY", "your_google_places_api_key_here")
+
 
 def pytest_configure(config):
     """Configure pytest."""
@@ -49,6 +49,30 @@ class TestComponents:
         
         return restaurants
 
+    async def test_google_places_coordinate_search(self):
+        """Test coordinate inputs go through Nearby Search."""
+        print("\n=== Testing Coordinate Search ===")
+
+        client = GooglePlacesClient()
+
+        restaurants = await client.search_restaurants(
+            location="40.7128,-74.0060",
+            cuisine_type="Italian",
+            rank_by_distance=True
+        )
+
+        # Assertions
+        assert isinstance(restaurants, list), "Should return a list"
+        print(f"✅ Found {len(restaurants)} restaurants near coordinates")
+
+        if restaurants:
+            first_restaurant = restaurants[0]
+            assert first_restaurant["address"], "Should map vicinity to address"
+            assert "google_place_id" in first_restaurant, "Should have place ID"
+            print(f"   Closest: {first_restaurant['name']} ({first_restaurant['address']})")
+
+        return restaurants
+
     async def test_restaurant_service(self):
         """Test restaurant service layer."""
         print("\n=== Testing Restaurant Service ===")
@@ -75,6 +99,30 @@ class TestComponents:
         
         return restaurants
 
+    async def test_restaurant_service_streaming(self):
+        """Test restaurant service yields multi-page results page by page."""
+        print("\n=== Testing Streaming Restaurant Search ===")
+        
+        service = RestaurantService()
+        
+        pages = []
+        async for page in service.stream_restaurants(
+            location="New York, NY",
+            max_results=45,
+            timeout_seconds=30
+        ):
+            pages.append(page)
+            print(f"   Page {len(pages)}: {len(page)} restaurants")
+        
+        # Assertions
+        restaurants = [restaurant for page in pages for restaurant in page]
+        assert len(restaurants) <= 45, "Should respect max_results limit"
+        assert len(pages) <= 3, "Google Places returns at most 3 pages"
+        assert all(len(page) <= 20 for page in pages), "Pages hold at most 20 results"
+        print(f"✅ Streamed {len(restaurants)} restaurants in {len(pages)} pages")
+        
+        return restaurants
+
 
 # Standalone functions for manual testing
 async def run_component_tests():
@@ -96,9 +144,11 @@ async def run_component_tests():
         # Run tests
         print("\n--- Testing Google Places Client ---")
         await test_instance.test_google_places_client()
+        await test_instance.test_google_places_coordinate_search()
         
         print("\n--- Testing Restaurant Service ---")
         await test_instance.test_restaurant_service()
+        await test_instance.test_restaurant_service_streaming()
         
         print("\n🎉 All component tests passed!")
         return True
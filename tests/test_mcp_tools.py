@@ -111,6 +111,30 @@ class TestMCPTools:
         
         return data
     
+    async def test_search_restaurants_deadline(self):
+        """Test restaurant search returns partial results when the deadline hits."""
+        print("\n=== Testing Search Deadline ===")
+        
+        # Warm the recent-results cache, then search with a tiny budget
+        await self.mock_server.call_tool("search_restaurants", location="Chicago, IL")
+        result = await self.mock_server.call_tool(
+            "search_restaurants",
+            location="Chicago, IL",
+            timeout_seconds=0.001
+        )
+        
+        content = result.content[0].text
+        data = json.loads(content)
+        
+        # Assertions
+        assert data.get("success") is True, f"Deadline should not fail the call: {data.get('error')}"
+        assert data["partial"] is True, "A 1ms budget cannot complete an upstream call"
+        assert data["total_results"] == len(data["restaurants"]), "Counts should match"
+        
+        print(f"✅ partial={data['partial']} with {data['total_results']} restaurants")
+        
+        return data
+    
     async def test_search_restaurants_invalid_location(self):
         """Test restaurant search with invalid location."""
         print("\n=== Testing Invalid Location Handling ===")
@@ -149,6 +173,7 @@ async def run_mcp_tool_tests():
         # Run all tests
         await test_instance.test_search_restaurants_basic()
         await test_instance.test_search_restaurants_with_params()
+        await test_instance.test_search_restaurants_deadline()
         await test_instance.test_search_restaurants_invalid_location()
         
         print("\n🎉 All MCP tool tests completed!")
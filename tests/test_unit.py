@@ -0,0 +1,484 @@
+"""Offline tests that need no Google Places API key."""
+
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+import anyio
+import pytest
+from mcp import ClientSession
+from mcp.shared.memory import create_client_server_memory_streams
+from mcp.types import LoggingMessageNotification, ServerNotification
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from config.settings import settings
+from scripts.places_stub_server import start_stub_server
+from src.food_mcp.clients.google_places import GooglePlacesClient
+from src.food_mcp.diagnostics import LoopMonitor, ToolProfiler
+from src.food_mcp.mcp_server import McpServer
+from src.food_mcp.models import Base, RestaurantCache
+from src.food_mcp.services.place_sync_service import PlaceSyncService
+from src.food_mcp.services.restaurant_service import RestaurantService, SearchDeadlineExceeded
+from src.food_mcp.tools.restaurant_tools import register_restaurant_tools
+from tests.test_mcp_tools import MockMCPServer
+
+
+@pytest.fixture
+def places_stub(monkeypatch):
+    """Start a local Google Places stand-in and point settings at it."""
+    servers = []
+
+    def start(**kwargs):
+        server, base_url = start_stub_server(jitter=0, **kwargs)
+        servers.append(server)
+        monkeypatch.setattr(settings, "google_places_api_key", "AIzaStubKey")
+        monkeypatch.setattr(settings, "google_places_base_url", base_url)
+        monkeypatch.setattr(settings, "page_token_delay_seconds", 0)
+        return server
+
+    yield start
+
+    for server in servers:
+        server.shutdown()
+
+
+@asynccontextmanager
+async def mcp_client(server: McpServer):
+    """Connect an MCP client session to the server over in-memory streams."""
+    async with create_client_server_memory_streams() as (client_streams, server_streams):
+        async with anyio.create_task_group() as task_group:
+            task_group.start_soon(server.serve, *server_streams)
+            async with ClientSession(*client_streams) as session:
+                session.initialize_result = await session.initialize()
+                yield session
+            task_group.cancel_scope.cancel()
+
+
+class TestCoordinateParsing:
+    """Test detection of "lat,lng" locations."""
+
+    def test_parse_coordinates(self):
+        """Test coordinate pairs are parsed and other inputs rejected."""
+        assert GooglePlacesClient.parse_coordinates("40.7128,-74.0060") == (40.7128, -74.0060)
+        assert GooglePlacesClient.parse_coordinates(" 40.7128 , -74.0060 ") == (40.7128, -74.0060)
+        assert GooglePlacesClient.parse_coordinates("New York, NY") is None
+        assert GooglePlacesClient.parse_coordinates("95.0,10.0") is None, "Latitude out of range"
+        assert GooglePlacesClient.parse_coordinates("10.0,181.0") is None, "Longitude out of range"
+
+
+class TestSearchRouting:
+    """Test which Places endpoint and parameters a search uses."""
+
+    @pytest.mark.asyncio
+    async def test_coordinates_use_nearby_search(self, places_stub):
+        """Test coordinates go to Nearby Search with the cuisine as keyword."""
+        server = places_stub(latency_ms=10)
+
+        restaurants = await GooglePlacesClient().search_restaurants(
+            location="40.7128,-74.0060",
+            radius=5000,
+            cuisine_type="Italian"
+        )
+
+        path, params = server.requests[0]
+        assert path.endswith("/nearbysearch/json"), f"Expected Nearby Search, got {path}"
+        assert params["location"] == "40.7128,-74.006", "Coordinates should be the search location"
+        assert params["keyword"] == "Italian", "Cuisine should be sent as keyword"
+        assert params["radius"] == "5000", "Radius should be sent"
+        assert "rankby" not in params, "Ranking defaults to prominence"
+        assert len(restaurants) == 20, "One page of results expected"
+        assert all(r["address"].endswith("Test Street") for r in restaurants), "Vicinity should become address"
+
+    @pytest.mark.asyncio
+    async def test_rank_by_distance_omits_radius(self, places_stub):
+        """Test rank_by_distance sends rankby=distance and no radius."""
+        server = places_stub(latency_ms=10)
+
+        await GooglePlacesClient().search_restaurants(location="40.7128,-74.0060", rank_by_distance=True)
+
+        path, params = server.requests[0]
+        assert path.endswith("/nearbysearch/json"), f"Expected Nearby Search, got {path}"
+        assert params["rankby"] == "distance", "Results should be ranked by distance"
+        assert "radius" not in params, "radius cannot be combined with rankby=distance"
+
+    @pytest.mark.asyncio
+    async def test_place_names_use_text_search(self, places_stub):
+        """Test a place name goes to Text Search with the cuisine in the query."""
+        server = places_stub(latency_ms=10)
+
+        restaurants = await GooglePlacesClient().search_restaurants(
+            location="New York, NY",
+            cuisine_type="Italian",
+            rank_by_distance=True
+        )
+
+        path, params = server.requests[0]
+        assert path.endswith("/textsearch/json"), f"Expected Text Search, got {path}"
+        assert params["query"] == "Italian restaurant", "Cuisine should be part of the query"
+        assert "rankby" not in params, "rank_by_distance only applies to coordinates"
+        assert all(r["address"].endswith("Test Street") for r in restaurants), "formatted_address should be the address"
+
+
+class TestPlacesStub:
+    """Test deadlines and hedging against the local Places stand-in."""
+
+    @pytest.mark.asyncio
+    async def test_deadline_without_cache_returns_partial(self, places_stub, monkeypatch):
+        """Test a deadline with nothing cached returns an empty partial result."""
+        places_stub(latency_ms=1000)
+        monkeypatch.setattr(settings, "hedge_requests", False)
+
+        mock_server = MockMCPServer()
+        register_restaurant_tools(mock_server, RestaurantService())
+
+        started = time.monotonic()
+        result = await mock_server.call_tool(
+            "search_restaurants",
+            location="New York, NY",
+            timeout_seconds=0.2
+        )
+        elapsed = time.monotonic() - started
+        data = json.loads(result.content[0].text)
+
+        assert data["success"] is True, "Deadline should not fail the call"
+        assert data["partial"] is True, "Response should be flagged partial"
+        assert data["total_results"] == 0 and data["restaurants"] == [], "Nothing was cached"
+        assert elapsed < 0.6, f"Call should return at the deadline, took {elapsed:.2f}s"
+
+    @pytest.mark.asyncio
+    async def test_timeout_above_search_timeout_is_capped(self, places_stub, monkeypatch):
+        """Test a larger timeout_seconds is capped at SEARCH_TIMEOUT and returns partial."""
+        places_stub(latency_ms=2000)
+        monkeypatch.setattr(settings, "hedge_requests", False)
+        monkeypatch.setattr(settings, "search_timeout_seconds", 1)
+
+        mock_server = MockMCPServer()
+        register_restaurant_tools(mock_server, RestaurantService())
+
+        started = time.monotonic()
+        result = await mock_server.call_tool("search_restaurants", location="New York, NY", timeout_seconds=5)
+        elapsed = time.monotonic() - started
+        data = json.loads(result.content[0].text)
+
+        assert data["partial"] is True, "Timed out search should be flagged partial"
+        assert elapsed < 1.5, f"Budget should be capped at SEARCH_TIMEOUT, took {elapsed:.2f}s"
+
+    @pytest.mark.asyncio
+    async def test_http_timeout_returns_partial(self, places_stub, monkeypatch):
+        """Test an HTTP timeout before the deadline is reported as partial, not empty."""
+        places_stub(latency_ms=2000)
+        monkeypatch.setattr(settings, "hedge_requests", False)
+        monkeypatch.setattr(settings, "search_timeout_seconds", 0.5)
+        service = RestaurantService()
+        monkeypatch.setattr(settings, "search_timeout_seconds", 5)
+
+        with pytest.raises(SearchDeadlineExceeded) as exc_info:
+            await service.search_restaurants(location="New York, NY", timeout_seconds=5)
+
+        assert exc_info.value.partial_results == [], "Nothing was fetched or cached"
+
+    @pytest.mark.asyncio
+    async def test_failed_later_page_returns_partial(self, places_stub, monkeypatch):
+        """Test a failure on page 2 returns page 1 flagged partial."""
+        places_stub(latency_ms=10)
+        service = RestaurantService()
+        pages = service.google_client.iter_restaurant_pages
+
+        async def failing_pages(**kwargs):
+            async for page in pages(**kwargs):
+                yield page
+                raise RuntimeError("second page failed")
+
+        monkeypatch.setattr(service.google_client, "iter_restaurant_pages", failing_pages)
+        mock_server = MockMCPServer()
+        register_restaurant_tools(mock_server, service)
+
+        result = await mock_server.call_tool("search_restaurants", location="New York, NY", max_results=45)
+        data = json.loads(result.content[0].text)
+
+        assert data["success"] is True, "Earlier pages should still be returned"
+        assert data["partial"] is True, "Truncated result should be flagged partial"
+        assert data["total_results"] == 20, "Only the first page arrived"
+
+    @pytest.mark.asyncio
+    async def test_slow_first_request_is_hedged(self, places_stub, monkeypatch):
+        """Test a slow first request triggers a hedge and the first success wins."""
+        server = places_stub(scripted_latency_ms=[1000, 50])
+        monkeypatch.setattr(settings, "hedge_delay_ms", 100)
+
+        client = GooglePlacesClient()
+        started = time.monotonic()
+        restaurants = await client.search_restaurants(location="New York, NY")
+        elapsed = time.monotonic() - started
+
+        assert len(restaurants) == 20, "Hedged response should be returned"
+        assert server.request_count == 2, "A single hedge should have been sent"
+        assert elapsed < 0.6, f"Hedge should win over the slow request, took {elapsed:.2f}s"
+        assert client.latency.samples[-1] >= 0.1, "Latency should include the wait before hedging"
+
+    @pytest.mark.asyncio
+    async def test_hedges_in_flight_are_capped(self, places_stub, monkeypatch):
+        """Test concurrent slow calls send no more than HEDGE_MAX_IN_FLIGHT hedges."""
+        server = places_stub(latency_ms=400)
+        monkeypatch.setattr(settings, "hedge_delay_ms", 50)
+        monkeypatch.setattr(settings, "hedge_max_in_flight", 1)
+
+        client = GooglePlacesClient()
+        results = await asyncio.gather(*(
+            client.search_restaurants(location=f"City {i}") for i in range(3)
+        ))
+
+        assert all(len(restaurants) == 20 for restaurants in results), "Every call should succeed"
+        assert server.request_count == 4, "Three requests plus one capped hedge expected"
+
+
+class TestStreamingSearch:
+    """Test streamed searches over an MCP session."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, places_stub):
+        """Set up a server backed by the Places stand-in."""
+        places_stub(latency_ms=10)
+        self.server = McpServer("test")
+        register_restaurant_tools(self.server, RestaurantService())
+
+    @pytest.mark.asyncio
+    async def test_stream_without_logging_sends_no_notifications(self):
+        """Test a client that never enabled logging gets its result without draining notifications."""
+        async with mcp_client(self.server) as session:
+            assert session.initialize_result.capabilities.logging is not None, "Logging should be advertised"
+
+            with anyio.fail_after(10):
+                result = await session.call_tool(
+                    "search_restaurants",
+                    {"location": "Paris", "max_results": 45, "stream": True}
+                )
+
+        data = json.loads(result.content[0].text)
+        assert data["total_results"] == 45, "Every page should be in the tool result"
+
+    @pytest.mark.asyncio
+    async def test_stream_sends_pages_after_set_level(self):
+        """Test each page is sent as a log message once the client enabled logging."""
+        pages = []
+
+        async def drain(session):
+            async for message in session.incoming_messages:
+                if isinstance(message, ServerNotification) and isinstance(message.root, LoggingMessageNotification):
+                    pages.append(message.root.params.data)
+
+        async with mcp_client(self.server) as session:
+            await session.set_logging_level("info")
+            async with anyio.create_task_group() as task_group:
+                task_group.start_soon(drain, session)
+                with anyio.fail_after(10):
+                    result = await session.call_tool(
+                        "search_restaurants",
+                        {"location": "Paris", "max_results": 45, "stream": True}
+                    )
+                task_group.cancel_scope.cancel()
+
+        data = json.loads(result.content[0].text)
+        assert data["total_results"] == 45, "Every page should be in the tool result"
+        assert [page["page"] for page in pages] == [1, 2, 3], "One notification per page expected"
+        assert sum(len(page["restaurants"]) for page in pages) == 45, "Pages should add up to the result"
+
+
+class TestMcpServer:
+    """Test request handling over an MCP session."""
+
+    @pytest.mark.asyncio
+    async def test_tool_calls_run_concurrently(self, places_stub, monkeypatch):
+        """Test a slow tool call does not hold up the calls behind it."""
+        places_stub(latency_ms=300)
+        monkeypatch.setattr(settings, "hedge_requests", False)
+        server = McpServer("test")
+        register_restaurant_tools(server, RestaurantService())
+
+        async with mcp_client(server) as session:
+            started = time.monotonic()
+            with anyio.fail_after(10):
+                results = await asyncio.gather(*(
+                    session.call_tool("search_restaurants", {"location": f"City {i}"}) for i in range(5)
+                ))
+            elapsed = time.monotonic() - started
+
+        assert all(not result.isError for result in results), "Every call should succeed"
+        assert elapsed < 1.0, f"Calls should overlap, took {elapsed:.2f}s for 5 x 300ms"
+
+
+def make_place(i, rating=4.0):
+    """Formatted place as returned by GooglePlacesClient."""
+    return {
+        "google_place_id": f"place-{i}",
+        "name": f"Restaurant {i}",
+        "address": f"{i} Main St",
+        "latitude": 40.70 + i * 0.001,
+        "longitude": -74.00 + i * 0.001,
+        "rating": rating,
+        "user_ratings_total": 100,
+        "price_level": 2,
+        "types": ["restaurant", "food"]
+    }
+
+
+class TestPlaceSync:
+    """Test delta sync into an in-memory database."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch):
+        """Set up an isolated database and sync service."""
+        monkeypatch.setattr(settings, "google_places_api_key", "AIzaStubKey")
+        # One shared connection so sync_places sees the same database from worker threads
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        self.service = PlaceSyncService(session_factory=sessionmaker(bind=engine))
+        self.threshold = settings.closed_after_missed_refreshes
+
+    def closed_ids(self):
+        """Place ids flagged possibly_closed."""
+        with self.service.session_factory() as db:
+            rows = db.query(RestaurantCache).filter_by(possibly_closed=True)
+            return {row.google_place_id for row in rows}
+
+    def test_writes_only_new_and_changed_places(self):
+        """Test unchanged places are not rewritten."""
+        stats = self.service.sync_places([make_place(i) for i in range(4)], "nyc||10")
+        assert stats["inserted"] == 4, "First sync should insert every place"
+
+        # place-0 changed, place-4 is new
+        refreshed = [make_place(0, rating=4.5), make_place(1), make_place(2), make_place(3), make_place(4)]
+        stats = self.service.sync_places(refreshed, "nyc||10")
+        assert stats["inserted"] == 1, "Only the new place should be inserted"
+        assert stats["updated"] == 1, "Only the changed place should be updated"
+        assert stats["unchanged"] == 3, "Unchanged places should not be written"
+
+    def test_repeatedly_missing_place_is_flagged(self):
+        """Test a place missing from the same refresh key is flagged, then cleared when seen."""
+        self.service.sync_places([make_place(i) for i in range(4)], "nyc||10")
+
+        for _ in range(self.threshold):
+            stats = self.service.sync_places([make_place(0), make_place(1), make_place(3)], "nyc||10")
+            assert stats["missing"] == 1, "Place previously returned by this key should be missing"
+        assert self.closed_ids() == {"place-2"}, "Repeatedly missing place should be flagged"
+
+        self.service.sync_places([make_place(i) for i in range(4)], "nyc||10")
+        assert self.closed_ids() == set(), "Place seen again should be cleared"
+
+    def test_other_refresh_keys_do_not_count_as_misses(self):
+        """Test a narrower query does not flag places it would never return."""
+        self.service.sync_places([make_place(i) for i in range(20)], "nyc||10")
+
+        # e.g. a --cuisine Italian refresh of the same area
+        for _ in range(self.threshold):
+            stats = self.service.sync_places([make_place(i) for i in range(5)], "nyc|italian|10")
+            assert stats["missing"] == 0, "Places from another key are not misses"
+
+        assert self.closed_ids() == set(), "No place should be flagged"
+
+    def test_incomplete_refresh_does_not_count_misses(self):
+        """Test misses are not counted when some pages could not be fetched."""
+        self.service.sync_places([make_place(i) for i in range(40)], "nyc||10")
+
+        for _ in range(self.threshold):
+            stats = self.service.sync_places([make_place(i) for i in range(20)], "nyc||10", complete=False)
+            assert stats["missing"] == 0, "Truncated refresh should not count misses"
+
+        assert self.closed_ids() == set(), "No place should be flagged"
+
+    @pytest.mark.asyncio
+    async def test_refresh_area_with_failed_page_is_incomplete(self, monkeypatch):
+        """Test a page error keeps fetched places but counts no misses."""
+        self.service.sync_places([make_place(i) for i in range(40)], "new york||10")
+
+        async def failing_pages(**kwargs):
+            yield [make_place(i) for i in range(20)]
+            raise RuntimeError("second page failed")
+
+        monkeypatch.setattr(self.service.google_client, "iter_restaurant_pages", failing_pages)
+
+        for _ in range(self.threshold):
+            stats = await self.service.refresh_area("New York", radius_km=10)
+            assert stats["fetched"] == 20, "Pages fetched before the error should be synced"
+            assert stats["missing"] == 0, "Failed refresh should not count misses"
+
+        assert self.closed_ids() == set(), "No place should be flagged"
+
+
+    @pytest.mark.asyncio
+    async def test_refresh_area_at_result_cap_is_incomplete(self, monkeypatch):
+        """Test a refresh that hit the 60-result cap counts no misses, and a smaller one does."""
+        self.service.sync_places([make_place(i) for i in range(61)], "new york||10")
+
+        def pages_of(count):
+            async def pages(**kwargs):
+                for start in range(0, count, 20):
+                    yield [make_place(i) for i in range(start, min(start + 20, count))]
+            return pages
+
+        monkeypatch.setattr(self.service.google_client, "iter_restaurant_pages", pages_of(60))
+        for _ in range(self.threshold):
+            stats = await self.service.refresh_area("New York", radius_km=10)
+            assert stats["missing"] == 0, "Capped refresh should not count misses"
+        assert self.closed_ids() == set(), "No place should be flagged"
+
+        monkeypatch.setattr(self.service.google_client, "iter_restaurant_pages", pages_of(55))
+        stats = await self.service.refresh_area("New York", radius_km=10)
+        assert stats["missing"] == 6, "Refresh below the cap should count misses"
+
+
+class TestLoopMonitor:
+    """Test event loop stall detection."""
+
+    @pytest.mark.asyncio
+    async def test_reports_blocking_callback(self):
+        """Test loop monitor detects a callback blocking the event loop."""
+        monitor = LoopMonitor(threshold_ms=100, interval_ms=20)
+        monitor.start()
+
+        await asyncio.sleep(0.1)
+        time.sleep(0.3)  # Block the loop
+        await asyncio.sleep(0.1)
+
+        await monitor.stop()
+
+        assert monitor.stalls >= 1, "Blocking sleep should be reported as a stall"
+        assert monitor.max_lag >= 0.2, "Lag should reflect the blocked time"
+
+
+class TestToolProfiler:
+    """Test per-tool sampling profiles."""
+
+    @pytest.mark.asyncio
+    async def test_writes_folded_profile_per_tool(self, tmp_path):
+        """Test CPU work inside a tool is written to that tool's .folded file on stop."""
+
+        class BusyRestaurantService:
+            async def search_restaurants(self, **kwargs):
+                end = time.monotonic() + 0.3
+                while time.monotonic() < end:  # CPU-bound work on the loop
+                    pass
+                return []
+
+        mock_server = MockMCPServer()
+        register_restaurant_tools(mock_server, BusyRestaurantService())
+
+        profiler = ToolProfiler(str(tmp_path), interval_ms=1)
+        profiler.toggle()
+        assert profiler.running, "First toggle should start sampling"
+
+        await mock_server.call_tool("search_restaurants", location="Paris")
+
+        profiler.toggle()
+        profiler.join(5)
+        assert not profiler.running, "Second toggle should stop sampling"
+
+        files = list(tmp_path.glob("search_restaurants-*.folded"))
+        assert len(files) == 1, f"Expected one profile for the tool, got {list(tmp_path.iterdir())}"
+        lines = files[0].read_text().splitlines()
+        assert lines, "Profile should contain stacks"
+        assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) > 0, "Samples should be counted"
+        assert all("search_restaurants (restaurant_tools.py:" in line for line in lines), \
+            "Stacks should pass through the tool's frame"